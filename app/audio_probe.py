@@ -0,0 +1,89 @@
+from utilities import config, shutdown_event
+from app_logger import logger
+import threading
+import time
+
+AUDIO_POLL_INTERVAL = config.get("audio_poll_interval", 2)
+AUDIO_CACHE_TTL = config.get("audio_cache_ttl", 6)
+
+class AudioActivityProvider:
+    """Probe audio activity on a dedicated thread and publish a timestamped cached value.
+    - COM is initialized once for the probe thread and the session manager is kept alive
+      between polls (re-acquired only after a failure, e.g. a device change)
+    - Readers call `get()` which never blocks: it returns the cached value while it is
+      younger than the TTL and `default` otherwise
+    """
+    def __init__(self, poll_interval: float = AUDIO_POLL_INTERVAL, ttl: float = AUDIO_CACHE_TTL):
+        self.poll_interval = poll_interval
+        self.ttl = ttl
+        self.latest = (False, 0.0)
+        self.session_manager = None
+        self.thread = None
+        self.probe_count = 0
+        self.error_count = 0
+
+    def start(self):
+        """Start the probe thread (idempotent)."""
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self.run, daemon=True, name="AudioProbe")
+        self.thread.start()
+        logger.info(f"Audio probe started (poll {self.poll_interval}s, ttl {self.ttl}s)")
+
+    def get(self, default: bool = False):
+        """Return the last published audio state, or `default` when it is stale."""
+        value, stamp = self.latest
+        if time.monotonic() - stamp <= self.ttl:
+            return value
+        return default
+
+    def age(self):
+        """Seconds since the cached value was published."""
+        return time.monotonic() - self.latest[1]
+
+    def run(self):
+        from comtypes import CoInitialize, CoUninitialize
+        try:
+            CoInitialize()
+        except Exception:
+            pass
+        try:
+            while not shutdown_event.is_set():
+                try:
+                    self.latest = (self.probe(), time.monotonic())
+                    self.probe_count += 1
+                except Exception as e:
+                    self.error_count += 1
+                    self.session_manager = None
+                    logger.debug(f"Audio probe failed: {e}")
+                shutdown_event.wait(self.poll_interval)
+        finally:
+            self.session_manager = None
+            try:
+                CoUninitialize()
+            except Exception:
+                pass
+
+    def probe(self):
+        """Return True if there is any active audio session with non-zero volume."""
+        from pycaw.pycaw import AudioUtilities, AudioSession, IAudioSessionControl2
+        if self.session_manager is None:
+            self.session_manager = AudioUtilities.GetAudioSessionManager()
+            if self.session_manager is None:
+                return False
+
+        enumerator = self.session_manager.GetSessionEnumerator()
+        for i in range(enumerator.GetCount()):
+            try:
+                control = enumerator.GetSession(i)
+                if control is None:
+                    continue
+                session = AudioSession(control.QueryInterface(IAudioSessionControl2))
+                if session.State == 1 and session.SimpleAudioVolume.GetMasterVolume() > 0.0:
+                    return True
+            except Exception:
+                continue
+        return False
+
+"""Process-wide audio provider shared by the tracker."""
+audio_provider = AudioActivityProvider()
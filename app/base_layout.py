@@ -1,6 +1,6 @@
 from notification import show_reset_warning
 from userstate import UserActivityState
-from utilities import Utility
+from utilities import Utility, shutdown_event
 from app_logger import logger
 from db import Database
 from datetime import datetime 
@@ -10,7 +10,6 @@ import threading
 import time
 import os
 
-shutdown_event = threading.Event()
 tray_icon = None
 HOST_PATH = r"C:\Windows\System32\drivers\etc\hosts"
 db = Database()
@@ -58,8 +57,6 @@ class PyScout(ctk.CTk):
         self.blocked_apps = set(db.load_blocked_apps())
         self.blocked_urls = set(db.load_blocked_urls())
         self.dont_notify_apps = set(db.load_dont_notify_apps())
-        if self.blocked_apps:
-            Utility.start_app_blocker(self.blocked_apps, scan_interval=1)
 
         # ==== Modern Sidebar with Modern Colors ==== #
         self.sidebar_frame = ctk.CTkFrame(self, width=220, corner_radius=20, fg_color="#232b3b")
@@ -251,6 +248,8 @@ class PyScout(ctk.CTk):
     def graceful_shutdown(self):
         """Stop threads, save state, UI, and tray before exit."""
         shutdown_event.set()
+        from runtime import runtime
+        runtime.stop()
         time.sleep(0.5)
 
         global tray_icon
@@ -262,18 +261,17 @@ class PyScout(ctk.CTk):
 
         try:
             db = Database()
+            snapshot = self.user_state.snapshot
             with self.user_state.lock:
-                today = time.strftime("%Y-%m-%d")
-                screen = self.user_state.screen_time
-                brk = self.user_state.total_break_duration
-                app_data = self.user_state.screentime_per_app.copy()
+                self.user_state.sessions.close(time.time())
 
             db.update_daily_state(
-                date=today,
-                screen_time=screen,
-                break_time=brk,
-                app_usage_dict=app_data
+                date=snapshot.date,
+                screen_time=snapshot.screen_time,
+                break_time=snapshot.total_break_duration,
+                app_usage_dict=snapshot.app_usage
             )
+            db.insert_sessions(self.user_state.sessions.take_pending_rows())
             logger.info("[✓] Final state saved before shutdown.")
         except Exception as e:
             logger.info(f"[!] Failed to save state: {e}")
@@ -360,6 +358,7 @@ class PyScout(ctk.CTk):
         def toggle_tracking():
             self.is_tracking = not self.is_tracking
             self.user_state.is_paused = not self.is_tracking
+            self.user_state.notify_change()
             self.update_pause_btn()
             self.update_tracking_status_label()
 
@@ -379,10 +378,7 @@ class PyScout(ctk.CTk):
             def reset_timer():
                 today = datetime.now().strftime("%Y-%m-%d")
                 db.reset_data(date=today)
-                with self.user_state.lock:
-                    self.user_state.screen_time = 0
-                    self.user_state.total_break_duration = 0
-                    self.user_state.screentime_per_app.clear()
+                self.user_state.submit(UserActivityState.reset_today)
                 logger.info("Reset performed")
             show_reset_warning(reset_timer)
             self.load_dashboard()
@@ -606,9 +602,9 @@ class PyScout(ctk.CTk):
             if not hasattr(self, "break_time_progress") or not self.break_time_progress.winfo_exists():
                 return
 
-            with self.user_state.lock:
-                screen_sec = self.user_state.screen_time
-                break_sec = self.user_state.total_break_duration
+            snapshot = self.user_state.snapshot
+            screen_sec = snapshot.screen_time
+            break_sec = snapshot.total_break_duration
 
             screen_progress = min(1.0, screen_sec / 86400)
             break_progress = min(1.0, break_sec / 86400)
@@ -724,9 +720,6 @@ class PyScout(ctk.CTk):
         self.blocked_apps = set(db.load_blocked_apps())
         self.blocked_urls = set(db.load_blocked_urls())
 
-        if self.blocked_apps:
-            Utility.start_app_blocker(self.blocked_apps, scan_interval=1)
-
         top_label = ctk.CTkLabel(self.main_frame, text="Restricted Apps and Domains",
                                 font=("Segoe UI", 40, "bold"), text_color="#00bfae")
         top_label.pack(anchor="w", padx=30, pady=(40, 5))
@@ -747,11 +740,9 @@ class PyScout(ctk.CTk):
         
         def unblock_item(item, is_app , is_dont_notify = False):
             if is_app and not is_dont_notify:
-                Utility.stop_app_blocker()
                 db.remove_from_blocked_apps(app_name=item)
                 self.blocked_apps = set(db.load_blocked_apps())
-                if self.blocked_apps:
-                    Utility.start_app_blocker(self.blocked_apps, scan_interval=1)
+                Utility.start_app_blocker(self.blocked_apps)
             elif is_app and is_dont_notify:
                 db.unsuppress_notification(app_name=item)
                 self.dont_notify_apps = self.user_state.dont_notify_apps =  set(db.load_dont_notify_apps())
@@ -795,6 +786,10 @@ class PyScout(ctk.CTk):
                 add_btn = ctk.CTkButton(table_frame, text="+ Add App", font=("Segoe UI", 15, "bold"), fg_color="#205080",
                                         hover_color="#00bfae", text_color="#ffffff", corner_radius=8,
                                         command=lambda: add_app_db())
+                rule_btn = ctk.CTkButton(table_frame, text="+ Add Rule", font=("Segoe UI", 15, "bold"), fg_color="#205080",
+                                         hover_color="#00bfae", text_color="#ffffff", corner_radius=8,
+                                         command=lambda: add_rule_popup())
+                rule_btn.pack(side="bottom", pady=(0, 10))
             elif is_app and is_notification_suppress:
                 add_btn = ctk.CTkButton(table_frame, text="+ Add App", font=("Segoe UI", 15, "bold"), fg_color="#205080",
                         hover_color="#00bfae", text_color="#ffffff", corner_radius=8,
@@ -813,13 +808,58 @@ class PyScout(ctk.CTk):
             if file_path:
                 exe_name = os.path.basename(file_path)
                 if exe_name not in self.blocked_apps:
-                    Utility.stop_app_blocker()
                     db.insert_blocked_app(app_name=exe_name)
                     self.blocked_apps = set(db.load_blocked_apps())
-                    if self.blocked_apps:
-                        Utility.start_app_blocker(self.blocked_apps, scan_interval=1)
+                    Utility.start_app_blocker(self.blocked_apps)
                     refresh_blocked()
 
+        def add_rule_popup():
+            """Creates the popup to add a glob, regex or executable path rule."""
+            from block_rules import validate_rule, normalize_rule
+            popup = ctk.CTkToplevel(self)
+            popup.title("Add Block Rule")
+            popup.configure(fg_color="#1c1c1c")
+            popup.grab_set()
+
+            popup.update_idletasks()
+            width, height = 440, 250
+            x = (popup.winfo_screenwidth() // 2) - (width // 2)
+            y = (popup.winfo_screenheight() // 2) - (height // 2)
+            popup.geometry(f"{width}x{height}+{x}+{y}")
+
+            rule_kinds = {
+                "Exact name": "",
+                "Glob (e.g. steam*.exe)": "glob:",
+                "Regex (e.g. ^game.*)": "re:",
+                "Path prefix (e.g. D:\\Games\\)": "path:",
+            }
+            kind_var = ctk.StringVar(value="Glob (e.g. steam*.exe)")
+            ctk.CTkLabel(popup, text="Rule type:", font=("Segoe UI", 15), text_color="white").pack(pady=(20, 5))
+            ctk.CTkOptionMenu(popup, values=list(rule_kinds), variable=kind_var, font=("Segoe UI", 14)).pack(padx=20, fill="x")
+
+            entry = ctk.CTkEntry(popup, placeholder_text="Pattern", font=("Segoe UI", 14))
+            entry.pack(padx=20, pady=10, fill="x")
+
+            warn = ctk.CTkLabel(popup, text="", font=("Segoe UI", 12), text_color="#ca0000", wraplength=380)
+            warn.pack(padx=16, pady=(0, 4))
+
+            def submit():
+                """Validates the rule and stores it with the blocked apps."""
+                pattern = entry.get().strip()
+                rule = rule_kinds[kind_var.get()] + pattern
+                error = validate_rule(rule)
+                if error:
+                    warn.configure(text=error)
+                    return
+                if normalize_rule(rule) not in self.blocked_apps:
+                    db.insert_blocked_app(app_name=rule)
+                    self.blocked_apps = set(db.load_blocked_apps())
+                    Utility.start_app_blocker(self.blocked_apps)
+                popup.destroy()
+                refresh_blocked()
+
+            ctk.CTkButton(popup, text="Add", font=("Segoe UI", 14), fg_color="#3CBF8F", command=submit).pack(pady=10)
+
         def add_block_notification_app_db():
             """Creates the textbox popup to add app without notification."""
             from tkinter import filedialog
@@ -952,21 +992,21 @@ class PyScout(ctk.CTk):
 
             def on_radio_change(selected):
                 if selected == "Standard":
-                    with self.user_state.lock:
-                        self.user_state.setting_name = selected
-                        self.user_state.reminder_threshold = 45 * 60
-                        self.user_state.pomodoro = False
-                        self.user_state.pomodoro_cycle = 0
+                    self.user_state.setting_name = selected
+                    self.user_state.reminder_threshold = 45 * 60
+                    self.user_state.pomodoro = False
+                    self.user_state.pomodoro_cycle = 0
                     db.insert_app_setting(selected, self.user_state.reminder_threshold, self.user_state.pomodoro, self.user_state.pomodoro_cycle)
+                    self.user_state.notify_change()
                     self.load_settings_page()
 
                 elif selected == "Pomodoro":
-                    with self.user_state.lock:
-                        self.user_state.setting_name = selected
-                        self.user_state.pomodoro = True
-                        self.user_state.reminder_threshold = 25 * 60
-                        self.user_state.pomodoro_cycle = 0
+                    self.user_state.setting_name = selected
+                    self.user_state.pomodoro = True
+                    self.user_state.reminder_threshold = 25 * 60
+                    self.user_state.pomodoro_cycle = 0
                     db.insert_app_setting(selected, self.user_state.reminder_threshold, self.user_state.pomodoro, self.user_state.pomodoro_cycle)
+                    self.user_state.notify_change()
                     self.load_settings_page()
 
                 elif selected == "Custom":
@@ -1006,12 +1046,12 @@ class PyScout(ctk.CTk):
                 
                 def save_custom():
                     minutes = int(custom_threshold_var.get() or 45)
-                    with self.user_state.lock:
-                        self.user_state.setting_name = "Custom"
-                        self.user_state.pomodoro = False
-                        self.user_state.reminder_threshold = minutes * 60
-                        self.user_state.pomodoro_cycle = 0
+                    self.user_state.setting_name = "Custom"
+                    self.user_state.pomodoro = False
+                    self.user_state.reminder_threshold = minutes * 60
+                    self.user_state.pomodoro_cycle = 0
                     db.insert_app_setting("Custom", self.user_state.reminder_threshold, self.user_state.pomodoro, self.user_state.pomodoro_cycle)
+                    self.user_state.notify_change()
                     popup.destroy()
                     self.load_settings_page()
 
@@ -1069,6 +1109,7 @@ class PyScout(ctk.CTk):
                     self.user_state.break_setting_name = selected
                     self.user_state.break_threshold = 5* 60  
                     db.insert_break_setting(selected, self.user_state.break_threshold)
+                    self.user_state.notify_change()
                     self.load_settings_page()
                 elif selected == "Custom":
                     open_custom_break_popup()
@@ -1111,6 +1152,7 @@ class PyScout(ctk.CTk):
                     popup.destroy()
 
                     db.insert_break_setting("Custom", minutes * 60)
+                    self.user_state.notify_change()
                     self.load_settings_page()
 
                 ctk.CTkButton(
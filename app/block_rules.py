@@ -0,0 +1,123 @@
+from app_logger import logger
+import fnmatch
+import ntpath
+import time
+import re
+
+"""Rule prefixes stored in blocked_apps.app_name; a name without a prefix is an exact match."""
+EXACT = "exact"
+GLOB = "glob"
+REGEX = "re"
+PATH = "path"
+RULE_KINDS = (EXACT, GLOB, REGEX, PATH)
+
+def parse_rule(rule: str):
+    """Split a stored rule into (kind, pattern): 'glob:chrome*.exe' -> ('glob', 'chrome*.exe')."""
+    kind, sep, pattern = rule.partition(":")
+    if sep and kind in (GLOB, REGEX, PATH):
+        return kind, pattern
+    return EXACT, rule
+
+def normalize_rule(rule: str) -> str:
+    """Canonical stored form: names, globs and paths are case-folded, regexes are kept verbatim."""
+    kind, pattern = parse_rule(rule.strip())
+    pattern = pattern.strip()
+    if kind == EXACT:
+        return pattern.lower()
+    if kind == REGEX:
+        return f"{REGEX}:{pattern}"
+    if kind == PATH:
+        return f"{PATH}:{ntpath.normcase(pattern)}"
+    return f"{kind}:{pattern.lower()}"
+
+def validate_rule(rule: str):
+    """Return an error message for an invalid rule, or None."""
+    kind, pattern = parse_rule(rule.strip())
+    if not pattern.strip():
+        return "Rule pattern is empty."
+    if kind == REGEX:
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            return f"Invalid regular expression: {e}"
+    return None
+
+class BlockRuleMatcher:
+    """Blocked-app rules compiled once into the cheapest structure per rule type.
+    - exact names: one set lookup, tried first since most rules are plain executable names
+    - globs: translated and joined into a single case-insensitive regex
+    - regexes: compiled individually (user patterns may use groups/backreferences)
+    - path prefixes: one str.startswith(tuple) call on the normalized executable path
+    Per-check cost is tracked so scanner stats show what matching costs per scanned process.
+    """
+    def __init__(self, rules=()):
+        self.rules = frozenset(normalize_rule(rule) for rule in rules if rule and rule.strip())
+        self.exact = set()
+        globs, self.regexes, paths = [], [], []
+        for rule in self.rules:
+            kind, pattern = parse_rule(rule)
+            if kind == EXACT:
+                self.exact.add(pattern)
+            elif kind == GLOB:
+                globs.append(pattern)
+            elif kind == REGEX:
+                try:
+                    self.regexes.append((re.compile(pattern, re.IGNORECASE), rule))
+                except re.error as e:
+                    logger.error(f"Skipping invalid block rule {rule!r}: {e}")
+            else:
+                paths.append(pattern)
+        self.globs = tuple(globs)
+        self.glob_re = re.compile("|".join(fnmatch.translate(g) for g in globs), re.IGNORECASE) if globs else None
+        self.paths = tuple(paths)
+        self.needs_exe = bool(self.paths)
+        self.checks = 0
+        self.hits = dict.fromkeys(RULE_KINDS, 0)
+        self.match_ns = 0
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __contains__(self, name):
+        return self.match(name) is not None
+
+    def match(self, name: str, exe: str = None):
+        """Return the rule that blocks a process with this name/executable path, or None."""
+        started = time.perf_counter_ns()
+        self.checks += 1
+        try:
+            if not name:
+                return None
+            lname = name.lower()
+            if lname in self.exact:
+                self.hits[EXACT] += 1
+                return lname
+            if self.glob_re and self.glob_re.match(lname):
+                self.hits[GLOB] += 1
+                return next((f"{GLOB}:{g}" for g in self.globs if fnmatch.fnmatchcase(lname, g)), GLOB)
+            for regex, rule in self.regexes:
+                if regex.search(name):
+                    self.hits[REGEX] += 1
+                    return rule
+            if exe and self.paths:
+                path = ntpath.normcase(exe)
+                if path.startswith(self.paths):
+                    self.hits[PATH] += 1
+                    return next(f"{PATH}:{p}" for p in self.paths if path.startswith(p))
+            return None
+        finally:
+            self.match_ns += time.perf_counter_ns() - started
+
+    def stats(self):
+        return {
+            "rules": len(self.rules),
+            "checks": self.checks,
+            "hits": dict(self.hits),
+            "avg_match_us": round(self.match_ns / max(1, self.checks) / 1000, 3),
+        }
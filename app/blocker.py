@@ -0,0 +1,128 @@
+from utilities import Utility, BLOCKER_SCAN_INTERVAL
+from process_scanner import IncrementalScanner
+from block_rules import BlockRuleMatcher
+from types import MappingProxyType
+from app_logger import logger
+from typing import NamedTuple
+import threading
+
+class RuleSet(NamedTuple):
+    """Immutable, versioned block rules; replaced as a whole on every edit."""
+    version: int
+    matcher: BlockRuleMatcher
+    layers: MappingProxyType
+
+class BlockerService:
+    """The single app-blocking pipeline of the process: one scanner and one WMI watcher.
+    - Rules are grouped in named layers (the user's list, and later schedules/quotas);
+      `set_rules` rebuilds the matcher and swaps in a new RuleSet with one reference assignment
+    - The scanner reads `self.rules` once per pass and forgets its PID table when the version
+      changes, so running processes are re-checked against the new rules on the next pass
+    - Starting is idempotent; with no rules the pipeline idles instead of being torn down
+    - On the async runtime the scan and the watcher run as runtime tasks instead of threads
+    """
+    def __init__(self, scan_interval: float = BLOCKER_SCAN_INTERVAL):
+        self.scan_interval = scan_interval
+        self.lock = threading.Lock()
+        self.rules = RuleSet(0, BlockRuleMatcher(), MappingProxyType({}))
+        self.scanner = IncrementalScanner()
+        self.scanned_version = 0
+        self.stop_event = None
+        self.threads = []
+        self.on_runtime = False
+        self.kills = 0
+        self.kill_failures = 0
+
+    def set_rules(self, rules, layer: str = "user"):
+        """Replace one rule layer and publish a new rule set version."""
+        with self.lock:
+            layers = dict(self.rules.layers)
+            rules = frozenset(rules)
+            if layers.get(layer, frozenset()) == rules:
+                return self.rules.version
+            if rules:
+                layers[layer] = rules
+            else:
+                layers.pop(layer, None)
+            matcher = BlockRuleMatcher(frozenset().union(*layers.values()))
+            self.rules = RuleSet(self.rules.version + 1, matcher, MappingProxyType(layers))
+        logger.info(f"Block rules v{self.rules.version}: {len(matcher)} rules ({', '.join(sorted(layers)) or 'none'})")
+        return self.rules.version
+
+    def match(self, name: str, exe: str = None):
+        """Match against the current rule set (used by the WMI watcher)."""
+        return self.rules.matcher.match(name, exe)
+
+    def scan_once(self):
+        """Run one incremental scan pass against the current rules and kill the matches."""
+        rules = self.rules
+        if not rules.matcher:
+            return
+        if rules.version != self.scanned_version:
+            self.scanner.reset()
+            self.scanned_version = rules.version
+        matches = self.scanner.scan(rules.matcher)
+        if not matches:
+            return
+        for pid, name in matches:
+            logger.info(f"[SCAN] Blocking {name} (PID: {pid})")
+        report = Utility.kill_process_trees([pid for pid, _ in matches])
+        self.kills += report.killed
+        self.kill_failures += len(report.alive) + len(report.denied)
+        logger.info(f"[SCAN] Killed {report.killed} processes for {report.requested} matches "
+                    f"in {report.latency * 1000:.1f} ms ({len(report.alive) + len(report.denied)} failed)")
+
+    def run_scanner(self, stop_event: threading.Event):
+        while not stop_event.is_set():
+            try:
+                self.scan_once()
+            except Exception as e:
+                logger.error(f"[SCAN] Unexpected error: {e}", exc_info=True)
+            stop_event.wait(self.scan_interval)
+        logger.info(f"[SCAN] Scanner stopped: {self.stats()}")
+
+    def is_running(self):
+        return self.on_runtime or any(t.is_alive() for t in self.threads)
+
+    def start(self):
+        """Start the scanner and watcher once per process."""
+        with self.lock:
+            if self.is_running():
+                return
+            self.stop_event = threading.Event()
+            from runtime import runtime
+            if runtime.is_running():
+                runtime.start_blocker(self, self.stop_event)
+                self.on_runtime = True
+            else:
+                self.threads = [
+                    threading.Thread(target=self.run_scanner, args=(self.stop_event,), daemon=True, name="BlockerScan"),
+                    threading.Thread(target=Utility.wmi_event_watcher, args=(self, self.stop_event), daemon=True, name="BlockerWMI"),
+                ]
+                for thread in self.threads:
+                    thread.start()
+        logger.info(f"App blocker started (scan every {self.scan_interval}s).")
+
+    def stop(self):
+        """Stop the pipeline; threads exit on their next wait/timeout."""
+        with self.lock:
+            if self.stop_event:
+                self.stop_event.set()
+            if self.on_runtime:
+                from runtime import runtime
+                runtime.stop_blocker()
+                self.on_runtime = False
+            self.threads = []
+        logger.info("App blocker stopped.")
+
+    def stats(self):
+        return {
+            "version": self.rules.version,
+            "kills": self.kills,
+            "kill_failures": self.kill_failures,
+            "scanner": self.scanner.stats(),
+            "matching": self.rules.matcher.stats(),
+        }
+
+"""Process-wide blocker; the UI edits its rules, main starts it."""
+blocker_service = BlockerService()
@@ -0,0 +1,154 @@
+from typing import NamedTuple
+from app_logger import logger
+import threading
+import math
+import time
+import sys
+
+"""Gaps this much longer than the expected interval are treated as a suspend when no OS counter is available."""
+SUSPEND_FALLBACK_THRESHOLD = 15.0
+
+"""Timer stats are logged every this many seconds."""
+STATS_LOG_INTERVAL = 15 * 60
+
+def _make_suspend_counter():
+    """Return a function giving the total time (ns) the machine spent suspended since boot, or None.
+    - Windows: GetTickCount64 includes sleep/hibernate, QueryUnbiasedInterruptTime excludes it
+    - Linux: CLOCK_BOOTTIME includes suspend, CLOCK_MONOTONIC excludes it
+    """
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.GetTickCount64.restype = ctypes.c_ulonglong
+            unbiased = ctypes.c_ulonglong()
+
+            def suspended_ns():
+                total_ms = kernel32.GetTickCount64()
+                kernel32.QueryUnbiasedInterruptTime(ctypes.byref(unbiased))
+                return total_ms * 1_000_000 - unbiased.value * 100
+            suspended_ns()
+            return suspended_ns
+        except Exception:
+            return None
+    if hasattr(time, "CLOCK_BOOTTIME"):
+        return lambda: time.clock_gettime_ns(time.CLOCK_BOOTTIME) - time.monotonic_ns()
+    return None
+
+suspended_ns = _make_suspend_counter()
+
+"""time.monotonic keeps counting through sleep on Windows (QPC/GetTickCount64) but not on Linux."""
+MONOTONIC_INCLUDES_SUSPEND = sys.platform == "win32"
+
+class Tick(NamedTuple):
+    """Timing of one timer callback; all values in seconds.
+    `elapsed` is awake time since the previous tick, `suspended` the time spent in sleep/hibernate.
+    """
+    elapsed: float
+    suspended: float
+    lateness: float
+
+    @property
+    def gap(self):
+        """Total time since the previous tick, awake or not."""
+        return self.elapsed + self.suspended
+
+class TickClock:
+    """Monotonic tick scheduler with explicit suspend detection and jitter/drift statistics.
+    - Elapsed time comes from time.monotonic_ns(), so NTP/DST/manual clock changes don't skew it
+    - The suspended part of a gap is read from OS counters (or inferred from a large overshoot)
+      and reported separately so it can be credited as a break instead of screen time
+    - Jitter is the lateness of each wakeup versus its deadline; drift is the accumulated lateness
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = threading.Lock()
+        self.last_ns = None
+        self.deadline_ns = None
+        self.last_suspended_ns = suspended_ns() if suspended_ns else 0
+        self.ticks = 0
+        self.jitter_samples = 0
+        self.suspends = 0
+        self.suspended_total = 0.0
+        self.jitter_mean = 0.0
+        self.jitter_m2 = 0.0
+        self.jitter_max = 0.0
+        self.drift = 0.0
+        self.next_stats_log = time.monotonic() + STATS_LOG_INTERVAL
+
+    def tick(self, expected_interval: float) -> Tick:
+        """Mark a timer wakeup and return how much time passed since the previous one."""
+        now_ns = time.monotonic_ns()
+        elapsed = 0.0 if self.last_ns is None else (now_ns - self.last_ns) / 1e9
+        lateness = 0.0 if self.deadline_ns is None else (now_ns - self.deadline_ns) / 1e9
+        self.last_ns = now_ns
+
+        if suspended_ns:
+            total = suspended_ns()
+            suspended = max(0.0, (total - self.last_suspended_ns) / 1e9)
+            self.last_suspended_ns = total
+            if suspended < 1.0:
+                suspended = 0.0
+            if MONOTONIC_INCLUDES_SUSPEND:
+                suspended = min(suspended, elapsed)
+                elapsed -= suspended
+        elif MONOTONIC_INCLUDES_SUSPEND and elapsed > expected_interval + SUSPEND_FALLBACK_THRESHOLD:
+            suspended = elapsed - expected_interval
+            elapsed = expected_interval
+        else:
+            suspended = 0.0
+
+        with self.lock:
+            self.ticks += 1
+            if suspended:
+                self.suspends += 1
+                self.suspended_total += suspended
+                logger.info(f"[{self.name}] Resume detected after {suspended:.1f}s suspended.")
+            elif self.deadline_ns is not None:
+                self.drift += lateness
+                self.jitter_samples += 1
+                delta = lateness - self.jitter_mean
+                self.jitter_mean += delta / self.jitter_samples
+                self.jitter_m2 += delta * (lateness - self.jitter_mean)
+                self.jitter_max = max(self.jitter_max, abs(lateness))
+
+        if time.monotonic() >= self.next_stats_log:
+            self.next_stats_log = time.monotonic() + STATS_LOG_INTERVAL
+            logger.info(f"[{self.name}] Timer stats: {self.stats()}")
+        return Tick(elapsed, suspended, lateness)
+
+    def schedule(self, interval: float) -> float:
+        """Set the next deadline `interval` after the previous one and return the delay until it.
+        Deadlines that fell behind by more than one interval (stall/suspend) restart from now.
+        """
+        now_ns = time.monotonic_ns()
+        step = int(interval * 1e9)
+        if self.deadline_ns is None or now_ns - self.deadline_ns > step:
+            self.deadline_ns = now_ns + step
+        else:
+            self.deadline_ns += step
+        return max(0.0, (self.deadline_ns - now_ns) / 1e9)
+
+    def restart(self):
+        """Drop the current deadline so the next `schedule` counts from now (e.g. early wakeup)."""
+        self.deadline_ns = None
+
+    def remaining(self) -> float:
+        """Seconds left until the current deadline."""
+        if self.deadline_ns is None:
+            return 0.0
+        return max(0.0, (self.deadline_ns - time.monotonic_ns()) / 1e9)
+
+    def stats(self):
+        """Return jitter (ms), drift (ms) and suspend statistics."""
+        with self.lock:
+            samples = max(1, self.jitter_samples)
+            return {
+                "ticks": self.ticks,
+                "jitter_mean_ms": round(self.jitter_mean * 1000, 3),
+                "jitter_stdev_ms": round(math.sqrt(self.jitter_m2 / samples) * 1000, 3),
+                "jitter_max_ms": round(self.jitter_max * 1000, 3),
+                "drift_ms": round(self.drift * 1000, 3),
+                "suspends": self.suspends,
+                "suspended_seconds": round(self.suspended_total, 1),
+            }
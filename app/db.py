@@ -1,5 +1,6 @@
 from contextlib import contextmanager
 from utilities import Utility
+from block_rules import normalize_rule
 from db_logger import logger
 import schema
 import sqlite3
@@ -61,7 +62,8 @@ class Database:
             'blocked_urls': schema.CREATE_TABLE_BLOCKED_URLS,
             'app_settings': schema.CREATE_TABLE_APP_SETTINGS,
             "break_settings" : schema.CREATE_TABLE_BREAK_SETTINGS,
-            "dont_notify" : schema.CREATE_TABLE_DONT_NOTIFY_APPS
+            "dont_notify" : schema.CREATE_TABLE_DONT_NOTIFY_APPS,
+            "session_log" : schema.CREATE_TABLE_SESSION_LOG
         }
         
         for attempt in range(MAX_RETRIES):
@@ -74,7 +76,8 @@ class Database:
                         if table_name not in existing_tables:
                             logger.info(f"Creating missing table: {table_name}")
                             cursor.execute(create_sql)
-                    
+
+                    cursor.execute(schema.CREATE_INDEX_SESSION_LOG_DATE)
                     conn.commit()
                 return
                 
@@ -169,7 +172,7 @@ class Database:
         """Handles db logic to block apps."""
         self.execute_with_retry(
             "INSERT OR IGNORE INTO blocked_apps (app_name) VALUES (?)",
-            (app_name.strip().lower(),)
+            (normalize_rule(app_name),)
         )
         logger.debug(f"Blocked app added: {app_name}")
 
@@ -213,7 +216,7 @@ class Database:
         """Handles db logic to unblock apps."""
         self.execute_with_retry(
             "DELETE FROM blocked_apps WHERE app_name = ?",
-            (app_name.strip().lower(),)
+            (normalize_rule(app_name),)
         )
         logger.debug(f"Blocked app removed: {app_name}")
 
@@ -280,6 +283,27 @@ class Database:
 
         raise sqlite3.OperationalError("DB still locked after retries.")
     
+    def insert_sessions(self, rows):
+        """Persist a batch of focus/break sessions (kind, app_name, start_time, end_time, date) in one transaction."""
+        if not rows:
+            return
+        for attempt in range(MAX_RETRIES):
+            try:
+                with self.get_connection() as (conn, cursor):
+                    cursor.executemany(
+                        "INSERT INTO session_log (kind, app_name, start_time, end_time, date) VALUES (?, ?, ?, ?, ?)",
+                        rows
+                    )
+                logger.debug(f"Persisted {len(rows)} sessions.")
+                return
+            except sqlite3.OperationalError as e:
+                if "locked" in str(e).lower():
+                    logger.debug(f"[SESSIONS] DB locked, retry {attempt+1}/{MAX_RETRIES}")
+                    time.sleep(RETRY_DELAY)
+                else:
+                    raise
+        raise sqlite3.OperationalError("DB still locked after retries.")
+
     def unsuppress_notification(self, app_name):
         """Removes app from dont notify table inorder to unsuppress notification."""
         try:
@@ -355,6 +379,15 @@ class Database:
         )
         return {app: duration for app, duration in data}
     
+    def load_sessions(self, date, kind=None):
+        """Returns the focus/break sessions of a day ordered by start time, optionally filtered by kind."""
+        query = "SELECT kind, app_name, start_time, end_time FROM session_log WHERE date = ?"
+        params = (date,)
+        if kind:
+            query += " AND kind = ?"
+            params = (date, kind)
+        return self.fetch_all(query + " ORDER BY start_time", params)
+
     def load_blocked_apps(self):
         """Returns the blocked apps to load into the in-memory variables."""
         return {row[0] for row in self.fetch_all("SELECT app_name FROM blocked_apps")}
@@ -0,0 +1,131 @@
+from app_logger import logger
+from db import app_dir
+import threading
+import keywords
+import time
+import os
+
+"""User keyword file: one keyword per line, '#' starts a comment. Picked up without a restart."""
+USER_KEYWORDS_PATH = os.path.join(app_dir, "video_keywords.txt")
+
+class AhoCorasick:
+    """Multi-pattern substring automaton; a scan costs O(len(text)) whatever the keyword count."""
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [False]
+        for pattern in patterns:
+            self._add(pattern)
+        self._link()
+
+    def _add(self, pattern):
+        node = 0
+        for ch in pattern:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(False)
+            node = nxt
+        self.out[node] = True
+
+    def _link(self):
+        """Breadth-first pass that fills failure links and propagates matches along them."""
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] or self.out[self.fail[nxt]]
+
+    def search(self, text):
+        """Return True if any pattern occurs in `text`."""
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                return True
+        return False
+
+class KeywordMatcher:
+    """Classify window/app names against the video keyword list.
+    - Built-in keywords plus the user keyword file are compiled into one automaton
+    - Results are memoized per distinct window name
+    - The user file is re-checked at most every `reload_interval` seconds and recompiled on change
+    """
+    def __init__(self, base_keywords=None, user_path: str = USER_KEYWORDS_PATH,
+                 reload_interval: float = 5.0, max_cache: int = 1024):
+        self.base_keywords = list(keywords.video_keywords if base_keywords is None else base_keywords)
+        self.user_path = user_path
+        self.reload_interval = reload_interval
+        self.max_cache = max_cache
+        self.lock = threading.Lock()
+        self.user_mtime = None
+        self.next_reload_check = 0.0
+        self.keywords = []
+        self.compiled = (AhoCorasick([]), {})
+        self.reload(force=True)
+
+    def load_user_keywords(self):
+        """Return keywords from the user file (empty if it doesn't exist)."""
+        try:
+            with open(self.user_path, "r", encoding="utf-8") as f:
+                lines = [line.split("#", 1)[0].strip().lower() for line in f]
+            return [line for line in lines if line]
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.error(f"Failed to read user keywords: {e}")
+            return []
+
+    def reload(self, force: bool = False):
+        """Recompile the automaton if the user keyword file changed (or when forced)."""
+        with self.lock:
+            try:
+                mtime = os.path.getmtime(self.user_path)
+            except OSError:
+                mtime = None
+            if not force and mtime == self.user_mtime:
+                return False
+            self.user_mtime = mtime
+            merged = dict.fromkeys(kw.lower() for kw in self.base_keywords + self.load_user_keywords() if kw)
+            self.keywords = list(merged)
+            self.compiled = (AhoCorasick(self.keywords), {})
+            logger.info(f"Video keyword matcher compiled ({len(self.keywords)} keywords).")
+            return True
+
+    def add_keywords(self, new_keywords):
+        """Append keywords to the user file and recompile."""
+        with open(self.user_path, "a", encoding="utf-8") as f:
+            for kw in new_keywords:
+                kw = kw.strip().lower()
+                if kw:
+                    f.write(kw + "\n")
+        self.reload(force=True)
+
+    def matches(self, window: str) -> bool:
+        """Return True if the window name contains any keyword."""
+        now = time.monotonic()
+        if now >= self.next_reload_check:
+            self.next_reload_check = now + self.reload_interval
+            self.reload()
+
+        automaton, cache = self.compiled
+        result = cache.get(window)
+        if result is None:
+            result = automaton.search(window.lower())
+            if len(cache) >= self.max_cache:
+                cache.clear()
+            cache[window] = result
+        return result
+
+"""Shared matcher for the tracker and reminder threads."""
+video_matcher = KeywordMatcher()
@@ -3,6 +3,8 @@ Search keywords for active video playback tracking.
 This list can be extended or modified based on user feedback or new trends in media consumption.
 The goal is to capture a wide range of applications that are likely to play video or audio content,
 while avoiding false positives from unrelated apps.   
+Extra keywords can be added one per line in userdata/video_keywords.txt; they are compiled
+together with this list by keyword_matcher and picked up without a restart.
 """
 
 
@@ -91,10 +91,21 @@ def start_background_services(state, user_db):
     """Start background tracking and reminder services."""
     import threading
     import trackers
+    from audio_probe import audio_provider
+    from runtime import runtime, ASYNC_RUNTIME
     try:
-        if state.blocked_apps:
-            Utility.start_app_blocker(state.blocked_apps, scan_interval=1)
-            logger.info("App blocker started")
+        audio_provider.start()
+
+        if ASYNC_RUNTIME:
+            runtime.start()
+            runtime.spawn("updater", runtime.once, "updater", run_silent_updates)
+            Utility.start_app_blocker(state.blocked_apps)
+            runtime.start_trackers(state)
+            logger.info("Background services started on the async runtime")
+            # Both jobs live on the runtime loop thread.
+            return runtime.thread, runtime.thread
+
+        Utility.start_app_blocker(state.blocked_apps)
         
         tracker_thread = threading.Thread(
             target=trackers.activity_tracker, 
@@ -166,5 +177,7 @@ def main():
     
 if __name__ == "__main__":
     # Utility.add_to_startup() 
-    run_silent_updates()
+    from runtime import ASYNC_RUNTIME
+    if not ASYNC_RUNTIME:
+        run_silent_updates()
     main()
\ No newline at end of file
@@ -3,24 +3,130 @@ from winotify import Notification, audio
 from utilities import Utility
 import customtkinter as ctk
 import tkinter as tk
-from userstate import UserActivityState
+from app_logger import logger
+import threading
+import queue
 import time
 
 
-def notify(state):
-    notification_msg = f"You've been active for {state.reminder_threshold // 60} mins. Break for {state.break_threshold // 60} mins."
-    """Shows a native Windows toast reminder notification."""
-    if state.pomodoro:
-        state.pomodoro_cycle += 1
-        print(f"Pomodoro cycle incremented to {state.pomodoro_cycle}")
-    if state.pomodoro_cycle == 2:
-        notification_msg = f"Pomodoro cycle complete! Take a longer break of at least {(state.break_threshold // 60) + 15} minutes."
-        print("Pomodoro cycle complete! Taking a longer break.")
-        state.pomodoro_cycle = 0
+"""Per-kind minimum spacing (seconds) between two notifications of the same kind."""
+RATE_LIMITS = {
+    "reminder": 60,
+    "paused": 15 * 60,
+}
+
+class NotificationDispatcher:
+    """Queue notifications and show them from a dedicated worker thread.
+    - `enqueue` never blocks: callers (tracker, reminder) return immediately
+    - An identical notification that is still pending is dropped (coalesced)
+    - Each kind is rate limited by RATE_LIMITS, counted from the last accepted one
+    - Send latency (enqueue -> shown) and drop counters are available from `stats()`
+    """
+    def __init__(self, rate_limits=None):
+        self.rate_limits = dict(RATE_LIMITS if rate_limits is None else rate_limits)
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.last_accepted = {}
+        self.thread = None
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def start(self):
+        """Start the worker thread (idempotent)."""
+        with self.lock:
+            if self.thread and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self.run, daemon=True, name="NotificationDispatcher")
+            self.thread.start()
+
+    def enqueue(self, kind: str, title: str, message: str, modal: bool = False) -> bool:
+        """Queue a toast (or in-app modal) notification; returns False if it was coalesced or rate limited."""
+        key = (kind, title, message, modal)
+        now = time.monotonic()
+        with self.lock:
+            if key in self.pending:
+                self.coalesced += 1
+                return False
+            last = self.last_accepted.get((kind, modal))
+            if last is not None and now - last < self.rate_limits.get(kind, 0):
+                self.rate_limited += 1
+                return False
+            self.last_accepted[(kind, modal)] = now
+            self.pending.add(key)
+        self.queue.put((key, now))
+        self.start()
+        return True
+
+    def run(self):
+        while True:
+            key, queued_at = self.queue.get()
+            kind, title, message, modal = key
+            try:
+                if modal:
+                    show_modal(title, message)
+                else:
+                    show_toast(title, message)
+                latency = time.monotonic() - queued_at
+                with self.lock:
+                    self.sent += 1
+                    self.total_latency += latency
+                    self.max_latency = max(self.max_latency, latency)
+            except Exception as e:
+                with self.lock:
+                    self.failed += 1
+                logger.error(f"Failed to show {kind} notification: {e}")
+            finally:
+                with self.lock:
+                    self.pending.discard(key)
+
+    def stats(self):
+        """Return dispatch counters and send-latency metrics (seconds)."""
+        with self.lock:
+            return {
+                "queued": self.queue.qsize(),
+                "sent": self.sent,
+                "failed": self.failed,
+                "coalesced": self.coalesced,
+                "rate_limited": self.rate_limited,
+                "avg_latency": (self.total_latency / self.sent) if self.sent else 0.0,
+                "max_latency": self.max_latency,
+            }
+
+"""Process-wide dispatcher used by the tracker and reminder threads."""
+dispatcher = NotificationDispatcher()
+
+def reminder_message(state, long_break: bool = False):
+    """Build the break reminder text (the longer pomodoro break when `long_break`)."""
+    if long_break:
+        return f"Pomodoro cycle complete! Take a longer break of at least {(state.break_threshold // 60) + 15} minutes."
+    return f"You've been active for {state.reminder_threshold // 60} mins. Break for {state.break_threshold // 60} mins."
+
+def notify(state, long_break: bool = False):
+    """Queue the break reminder; adds the in-app modal when system notifications are unavailable."""
+    message = reminder_message(state, long_break)
+    if Utility.is_notification_disabled() or Utility.is_focus_assist_on():
+        dispatcher.enqueue("reminder", "Reminder - PyScout", message, modal=True)
+    dispatcher.enqueue("reminder", "PyScout - Reminder", message)
+
+def notify_paused(state):
+    """Queue the paused warning; rate limiting spaces repeats 15 minutes apart."""
+    if not state.is_paused:
+        return
+    if Utility.is_notification_disabled() or Utility.is_focus_assist_on():
+        dispatcher.enqueue("paused", "PyScout - Warning", "[WARNING]: PyScout is paused.\nResume to continue tracking.", modal=True)
+    dispatcher.enqueue("paused", "PyScout - Reminder", "[WARNING]: PyScout is paused. Resume to continue tracking.")
+
+def show_toast(title, message):
+    """Shows a native Windows toast notification."""
     toast = Notification(
         app_id="PyScout",
-        title="PyScout - Reminder",
-        msg=notification_msg,
+        title=title,
+        msg=message,
         # icon = Utility.resource_path("assets/icon.ico"), # Development
         icon=Utility.resource_path("assets/icon.ico"), # Production
         duration='short'
@@ -29,28 +135,14 @@ def notify(state):
     toast.add_actions(label="OK", launch="")
     toast.show()
 
-def custom_notify(state):
-    """Display an in-app modal reminder when system notifications are unavailable."""
-
-    notification_msg = f"You’ve been active for {state.reminder_threshold // 60} mins.\nBreak for {state.break_threshold // 60} mins."
-
-    if state.pomodoro:
-        state.pomodoro_cycle += 1
-        print(f"Pomodoro cycle incremented to {state.pomodoro_cycle}")
-
-    if state.pomodoro_cycle >= 4:  
-        notification_msg = f"Pomodoro cycle complete! Take a longer break of at least {(state.break_threshold // 60) + 15} minutes."
-        print("Pomodoro cycle complete! Taking a longer break.")
-        state.pomodoro_cycle = 0
-
+def show_modal(title, message):
+    """Display an in-app modal when system notifications are unavailable (blocks until closed)."""
     root = tk.Tk()
-    root.title("Reminder - PyScout")
+    root.title(title)
     root.configure(bg="#181f2a")  
     root.resizable(False, False)
 
     window_width, window_height = 500, 150
-    root.geometry(f"{window_width}x{window_height}")
-
     screen_width = root.winfo_screenwidth()
     screen_height = root.winfo_screenheight()
     x = (screen_width // 2) - (window_width // 2)
@@ -62,7 +154,7 @@ def custom_notify(state):
 
     label = tk.Label(
         card,
-        text=notification_msg,
+        text=message,
         font=("Segoe UI", 14, "bold"),
         fg="white",
         bg="#232b3b",
@@ -94,75 +186,6 @@ def custom_notify(state):
 
     root.mainloop()
 
-def notify_paused(state):
-    """Display a notification when PyScout is paused."""
-    while state.is_paused:
-        toast = Notification(
-                app_id="PyScout",
-                title="PyScout - Reminder",
-                msg="[WARNING]: PyScout is paused. Resume to continue tracking.",
-                # icon=Utility.resource_path("assets/icon.ico"), # Development
-                icon=Utility.resource_path("assets/icon.ico"), # Production
-                duration='short'
-            )
-        toast.set_audio(audio.Reminder, loop=False)
-        toast.add_actions(label="OK", launch="")
-        toast.show()
-        time.sleep(15 * 60)  
-
-def custom_notify_paused(state):
-    """Display an in-app modal when PyScout is paused."""
-    while state.is_paused:
-        root = tk.Tk()
-        root.title("PyScout - Warning")
-        root.configure(bg="#181f2a")
-        root.resizable(False, False)
-
-        window_width, window_height = 500, 150
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
-        x = (screen_width // 2) - (window_width // 2)
-        y = (screen_height // 2) - (window_height // 2)
-        root.geometry(f"{window_width}x{window_height}+{x}+{y}")
-
-        card = tk.Frame(root, bg="#232b3b", bd=0, relief="flat")
-        card.place(relx=0.5, rely=0.5, anchor="center", relwidth=0.92, relheight=0.85)
-
-        label = tk.Label(
-            card,
-            text="[WARNING]: PyScout is paused.\nResume to continue tracking.",
-            font=("Segoe UI", 14, "bold"),
-            fg="white",
-            bg="#232b3b",
-            wraplength=440,
-            justify="center"
-        )
-        label.pack(pady=(15, 5))
-
-        close_btn = tk.Button(
-            card,
-            text="Close",
-            command=root.destroy,
-            bg="#2979ff",
-            fg="white",
-            font=("Segoe UI", 11, "bold"),
-            activebackground="#00bfae",
-            activeforeground="white",
-            relief="flat",
-            cursor="hand2",
-            padx=15,
-            pady=5
-        )
-        close_btn.pack(pady=(5, 10))
-
-        def on_enter(e): close_btn.config(bg="#00bfae")
-        def on_leave(e): close_btn.config(bg="#2979ff")
-        close_btn.bind("<Enter>", on_enter)
-        close_btn.bind("<Leave>", on_leave)
-
-        root.mainloop()
-        time.sleep(15 * 60)  
-
 def show_reset_warning(callback_on_proceed):
     """Display a centered modal to confirm reset, invoking a callback on proceed."""
     warning_dialog = ctk.CTkToplevel()
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+import threading
+import time
+
+class ProcessNameCache:
+    """Bounded LRU cache of process names keyed by (pid, create_time).
+    - A PID is resolved to its cache key through a small index, so an unchanged
+      foreground app costs a dictionary lookup per probe
+    - Entries are revalidated every `revalidate_after` seconds and dropped when the
+      process has exited or its PID was reused by a new process
+    """
+    def __init__(self, maxsize: int = 128, revalidate_after: float = 10.0):
+        self.maxsize = maxsize
+        self.revalidate_after = revalidate_after
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.pid_index = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_name(self, pid: int):
+        """Return the process name for `pid`, resolving it through psutil on a miss."""
+        import psutil
+        now = time.monotonic()
+        with self.lock:
+            key = self.pid_index.get(pid)
+            if key is not None:
+                entry = self.entries[key]
+                if now - entry[2] < self.revalidate_after:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                if entry[1].is_running():
+                    entry[2] = now
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._drop(key)
+
+            self.misses += 1
+
+        process = psutil.Process(pid)
+        with process.oneshot():
+            key = (pid, process.create_time())
+            name = process.name()
+
+        with self.lock:
+            stale = self.pid_index.get(pid)
+            if stale is not None and stale != key:
+                self._drop(stale)
+            self.entries[key] = [name, process, now]
+            self.entries.move_to_end(key)
+            self.pid_index[pid] = key
+            while len(self.entries) > self.maxsize:
+                oldest = next(iter(self.entries))
+                self._drop(oldest)
+        return name
+
+    def prune(self):
+        """Drop every entry whose process has exited."""
+        with self.lock:
+            dead = [key for key, entry in self.entries.items() if not entry[1].is_running()]
+            for key in dead:
+                self._drop(key)
+        return len(dead)
+
+    def _drop(self, key):
+        """Remove one entry (caller holds the lock)."""
+        self.entries.pop(key, None)
+        if self.pid_index.get(key[0]) == key:
+            del self.pid_index[key[0]]
+        self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.pid_index.clear()
+
+    def stats(self):
+        """Return hit/miss counters for diagnostics."""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+            }
@@ -0,0 +1,133 @@
+from userstate import UserActivityState
+from utilities import Utility, shutdown_event
+from app_logger import logger
+import notification
+import threading
+import time
+
+FOCUS = "focus"
+ON_BREAK = "on_break"
+BREAK_TAKEN = "break_taken"
+PAUSED = "paused"
+
+"""Every this many pomodoro reminders the break is a long one."""
+POMODORO_LONG_BREAK_EVERY = 2
+
+"""Extra minutes added to the break threshold for a long pomodoro break."""
+LONG_BREAK_BONUS = 15 * 60
+
+"""Longest sleep with nothing scheduled (paused, or a break already completed)."""
+MAX_SLEEP = 15 * 60
+
+"""Shortest sleep, so a deadline reached between tracker ticks isn't re-checked in a busy loop."""
+MIN_SLEEP = 1.0
+
+class ReminderScheduler:
+    """Deadline-driven stretch reminders with the pomodoro cycle as a small state machine.
+    - focus: sleep until the stretch would reach the threshold, then remind and reset it
+    - on_break: sleep until the break (long after a full pomodoro cycle) is complete
+    - break_taken: the break was long enough, the stretch restarts and nothing is due
+    - paused: nothing is due until tracking resumes
+    Between deadlines the scheduler only wakes when the state reports a change
+    (break started/ended, pause toggled, threshold edited) through `notify_change()`.
+    """
+    def __init__(self, state: UserActivityState):
+        self.state = state
+        self.phase = FOCUS
+        self.armed = True
+        self.long_break_due = False
+        self.break_began = None
+        self.changed = threading.Event()
+        self.wakeups = 0
+        self.reminders = 0
+        self.breaks_completed = 0
+        self.next_delay = None
+
+    def step(self) -> float:
+        """Advance the state machine from the latest snapshot and return the seconds until the next deadline."""
+        self.wakeups += 1
+        try:
+            snapshot = self.state.snapshot
+            if snapshot.is_paused:
+                self.enter(PAUSED)
+                delay = MAX_SLEEP
+            elif snapshot.on_break:
+                delay = self.step_break(snapshot)
+            else:
+                delay = self.step_focus(snapshot)
+        except Exception:
+            logger.exception("Crash in reminder scheduler:")
+            delay = MAX_SLEEP
+        self.next_delay = delay
+        return delay
+
+    def enter(self, phase):
+        if phase != self.phase:
+            logger.debug(f"Reminder phase {self.phase} -> {phase}")
+            self.phase = phase
+
+    def step_break(self, snapshot):
+        if self.phase == BREAK_TAKEN:
+            return MAX_SLEEP
+        if self.phase != ON_BREAK:
+            self.enter(ON_BREAK)
+            self.break_began = time.monotonic() - max(0.0, snapshot.idle_time)
+
+        required = self.state.break_threshold + (LONG_BREAK_BONUS if self.long_break_due else 0)
+        remaining = self.break_began + required - time.monotonic()
+        if remaining > 0:
+            return max(MIN_SLEEP, remaining)
+
+        logger.info(f"Break of {required // 60} mins completed, restarting the activity stretch.")
+        self.breaks_completed += 1
+        self.long_break_due = False
+        self.state.submit(UserActivityState.reset_stretch)
+        self.enter(BREAK_TAKEN)
+        return MAX_SLEEP
+
+    def step_focus(self, snapshot):
+        self.enter(FOCUS)
+        self.break_began = None
+        threshold = self.state.reminder_threshold
+        if snapshot.total_stretch_time < threshold:
+            self.armed = True
+            return max(MIN_SLEEP, threshold - snapshot.total_stretch_time)
+
+        if not self.armed:
+            # Our stretch reset is queued; look again once the tracker has applied it.
+            return max(MIN_SLEEP, snapshot.sample_interval)
+
+        self.armed = False
+        self.state.submit(UserActivityState.reset_stretch)
+        if Utility.get_active_window_title().strip().lower() in self.state.dont_notify_apps:
+            logger.debug("Reminder suppressed for the active app.")
+            return max(MIN_SLEEP, snapshot.sample_interval)
+
+        if self.state.pomodoro:
+            self.state.pomodoro_cycle += 1
+            if self.state.pomodoro_cycle >= POMODORO_LONG_BREAK_EVERY:
+                self.state.pomodoro_cycle = 0
+                self.long_break_due = True
+        self.reminders += 1
+        notification.notify(state=self.state, long_break=self.long_break_due)
+        return max(MIN_SLEEP, snapshot.sample_interval)
+
+    def run(self):
+        """Thread body: sleep until the next deadline or a state change, then step again."""
+        self.state.listeners.append(self.changed.set)
+        try:
+            while not shutdown_event.is_set():
+                self.changed.clear()
+                self.changed.wait(self.step())
+        finally:
+            self.state.listeners.remove(self.changed.set)
+
+    def stats(self):
+        return {
+            "phase": self.phase,
+            "wakeups": self.wakeups,
+            "reminders": self.reminders,
+            "breaks_completed": self.breaks_completed,
+            "pomodoro_cycle": self.state.pomodoro_cycle,
+            "next_delay": self.next_delay,
+        }
@@ -0,0 +1,213 @@
+from utilities import Utility, config, shutdown_event, timer_clocks
+from concurrent.futures import ThreadPoolExecutor
+from app_logger import logger
+from clock import TickClock
+import threading
+import asyncio
+import time
+
+"""Run the tracker, reminder, blocker and updater as tasks on one asyncio loop instead of one thread each."""
+ASYNC_RUNTIME = config.get("async_runtime", False)
+
+"""Worker threads shared by all tasks for blocking probes (window title, DB writes, process scans)."""
+RUNTIME_WORKERS = config.get("runtime_workers", 2)
+
+class TaskStats:
+    """Per-task run counts and busy time (time spent in the blocking callback)."""
+    __slots__ = ("runs", "errors", "busy_total", "busy_max", "last_run")
+
+    def __init__(self):
+        self.runs = 0
+        self.errors = 0
+        self.busy_total = 0.0
+        self.busy_max = 0.0
+        self.last_run = None
+
+    def record(self, busy: float, failed: bool):
+        self.runs += 1
+        self.errors += failed
+        self.busy_total += busy
+        self.busy_max = max(self.busy_max, busy)
+        self.last_run = time.monotonic()
+
+    def as_dict(self):
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "busy_avg_ms": round(self.busy_total / max(1, self.runs) * 1000, 3),
+            "busy_max_ms": round(self.busy_max * 1000, 3),
+        }
+
+class AsyncRuntime:
+    """One event loop thread hosting the periodic background jobs.
+    - Each job is an asyncio task; waiting costs no thread, only a timer on the loop
+    - Blocking calls are offloaded to a small bounded executor, so at most
+      `workers` probes run at once however many jobs are scheduled
+    - The WMI watcher is a blocking COM loop, so it gets its own single-worker executor
+    - Shutdown cancels every task and waits for them before the executors are closed
+    - Periodic jobs keep a TickClock (jitter/drift/suspend) plus busy-time stats per task
+    """
+    def __init__(self, workers: int = RUNTIME_WORKERS):
+        self.workers = workers
+        self.loop = None
+        self.thread = None
+        self.executor = None
+        self.watch_executor = None
+        self.tasks = {}
+        self.task_stats = {}
+        self.ready = threading.Event()
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """Start the loop thread (idempotent)."""
+        if self.is_running():
+            return
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="PyScoutWorker")
+        self.watch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PyScoutWatcher")
+        self.ready.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True, name="PyScoutRuntime")
+        self.thread.start()
+        self.ready.wait(5)
+        logger.info(f"Async runtime started ({self.workers} workers)")
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def call(self, fn, *args):
+        """Run `fn(*args)` on the loop thread (thread-safe)."""
+        self.loop.call_soon_threadsafe(fn, *args)
+
+    def spawn(self, name: str, coro_fn, *args):
+        """Start `coro_fn(*args)` as a named task, replacing a running task of the same name."""
+        def create():
+            old = self.tasks.pop(name, None)
+            if old:
+                old.cancel()
+            task = self.loop.create_task(coro_fn(*args), name=name)
+            self.tasks[name] = task
+            task.add_done_callback(lambda t: self.tasks.pop(name, None) if self.tasks.get(name) is t else None)
+        self.call(create)
+
+    def cancel(self, *names):
+        """Cancel the named tasks (thread-safe)."""
+        def cancel():
+            for name in names:
+                task = self.tasks.pop(name, None)
+                if task:
+                    task.cancel()
+        self.call(cancel)
+
+    async def run_blocking(self, name: str, func, *args, **kwargs):
+        """Run a blocking callback on the executor and record its busy time under `name`."""
+        stats = self.task_stats.setdefault(name, TaskStats())
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await self.loop.run_in_executor(self.executor, lambda: func(*args, **kwargs))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            failed = True
+            logger.exception(f"[{name}] Task callback crashed:")
+        finally:
+            stats.record(time.perf_counter() - started, failed)
+
+    async def periodic(self, name: str, interval: float, func, *args):
+        """Call `func(*args, tick=tick)` every `interval` seconds on monotonic deadlines."""
+        clock = timer_clocks[name] = TickClock(name)
+        while not shutdown_event.is_set():
+            tick = clock.tick(interval)
+            await self.run_blocking(name, func, *args, tick=tick)
+            await asyncio.sleep(clock.schedule(interval))
+
+    async def adaptive(self, name: str, sampler, func, *args):
+        """Periodic task whose interval follows the adaptive sampler (see Utility.run_adaptive_timer)."""
+        clock = timer_clocks[name] = TickClock(name)
+        while not shutdown_event.is_set():
+            tick = clock.tick(sampler.interval)
+            await self.run_blocking(name, func, *args, tick=tick)
+
+            clock.schedule(sampler.interval)
+            while (delay := clock.remaining()) > 0:
+                await asyncio.sleep(min(delay, sampler.fast_interval))
+                if sampler.level > 0 and sampler.input_detected(Utility.get_idle_time()):
+                    clock.restart()
+                    break
+
+    async def deadline(self, name: str, scheduler):
+        """Run a deadline scheduler: step it, then sleep until its deadline or a state change."""
+        changed = asyncio.Event()
+        listener = lambda: self.loop.call_soon_threadsafe(changed.set)
+        scheduler.state.listeners.append(listener)
+        try:
+            while not shutdown_event.is_set():
+                changed.clear()
+                delay = await self.run_blocking(name, scheduler.step)
+                try:
+                    await asyncio.wait_for(changed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            scheduler.state.listeners.remove(listener)
+
+    async def once(self, name: str, func, *args):
+        """Run a one-shot blocking job (e.g. the update check) on the executor."""
+        await self.run_blocking(name, func, *args)
+
+    async def watch(self, name: str, func, *args):
+        """Run a blocking loop on the watcher executor until it returns or the task is cancelled."""
+        await self.loop.run_in_executor(self.watch_executor, lambda: func(*args))
+
+    def start_trackers(self, state):
+        """Schedule the activity tracker and reminder jobs."""
+        from reminders import ReminderScheduler
+        import trackers
+        self.spawn("activity", self.adaptive, "activity", state.sampler, trackers.make_activity_logic(state))
+        self.spawn("reminder", self.deadline, "reminder", ReminderScheduler(state))
+
+    def start_blocker(self, service, stop_event: threading.Event):
+        """Schedule the blocker service's periodic scan and its WMI creation watcher."""
+        self.spawn("blocker_scan", self.periodic, "blocker_scan", service.scan_interval,
+                   lambda tick: service.scan_once())
+        self.spawn("blocker_wmi", self.watch, "blocker_wmi", Utility.wmi_event_watcher, service, stop_event)
+
+    def stop_blocker(self):
+        self.cancel("blocker_scan", "blocker_wmi")
+
+    def stats(self):
+        """Return busy-time stats per task and timer stats per periodic task."""
+        return {
+            name: {**stats.as_dict(), **(timer_clocks[name].stats() if name in timer_clocks else {})}
+            for name, stats in list(self.task_stats.items())
+        }
+
+    async def _shutdown(self):
+        tasks = list(self.tasks.values())
+        self.tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
+
+    def stop(self, timeout: float = 5.0):
+        """Cancel all tasks, wait for them to finish, then close the executors."""
+        if not self.is_running():
+            return
+        from blocker import blocker_service
+        blocker_service.stop()
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        self.thread.join(timeout)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.watch_executor.shutdown(wait=False, cancel_futures=True)
+        logger.info(f"Async runtime stopped. Task stats: {self.stats()}")
+
+"""Shared runtime; only started when `async_runtime` is enabled in config."""
+runtime = AsyncRuntime()
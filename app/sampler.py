@@ -0,0 +1,53 @@
+from app_logger import logger
+
+"""
+Sampling levels for the activity tracker as (idle seconds, interval seconds) pairs.
+The tracker samples fast while the user is active and backs off one level at a time
+during long idle periods, so an hour of idling does not cost 1800 full probe rounds.
+"""
+DEFAULT_LEVELS = (
+    (0, 2),
+    (5 * 60, 10),
+    (20 * 60, 30),
+)
+
+class AdaptiveSampler:
+    """Pick the tracker sampling interval from how long the user has been idle."""
+    def __init__(self, levels=DEFAULT_LEVELS):
+        self.levels = tuple(sorted(levels))
+        self.level = 0
+        self.last_idle = 0.0
+
+    @property
+    def fast_interval(self):
+        return self.levels[0][1]
+
+    @property
+    def interval(self):
+        """Current sampling interval in seconds."""
+        return self.levels[self.level][1]
+
+    def observe(self, idle_time):
+        """Feed the latest idle time and return the interval to use for the next tick.
+        - Any new input (idle time dropped) snaps straight back to the fast rate
+        - Otherwise back off at most one level per tick once the next idle step is reached
+        """
+        previous = self.level
+        if idle_time < self.last_idle or idle_time < self.fast_interval:
+            self.level = 0
+        elif self.level + 1 < len(self.levels) and idle_time >= self.levels[self.level + 1][0]:
+            self.level += 1
+        self.last_idle = idle_time
+
+        if self.level != previous:
+            logger.info(f"Sampling interval changed: {self.levels[previous][1]}s -> {self.interval}s (idle {idle_time:.0f}s)")
+        return self.interval
+
+    def input_detected(self, idle_time):
+        """Cheap check used between slow ticks: True once the user touched mouse/keyboard again."""
+        return self.level > 0 and (idle_time < self.last_idle or idle_time < self.fast_interval)
+
+    def reset(self):
+        """Return to the fast rate (e.g. after resume from pause)."""
+        self.level = 0
+        self.last_idle = 0.0
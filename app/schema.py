@@ -57,3 +57,18 @@ CREATE_TABLE_DONT_NOTIFY_APPS = """
         app_name TEXT UNIQUE
     )
 """
+
+CREATE_TABLE_SESSION_LOG = """
+    CREATE TABLE IF NOT EXISTS session_log(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT,
+        app_name TEXT,
+        start_time REAL,
+        end_time REAL,
+        date TEXT
+    )
+"""
+
+CREATE_INDEX_SESSION_LOG_DATE = """
+    CREATE INDEX IF NOT EXISTS idx_session_log_date ON session_log(date)
+"""
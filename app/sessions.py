@@ -0,0 +1,115 @@
+from app_logger import logger
+from array import array
+from datetime import datetime
+import threading
+import time
+
+FOCUS = 0
+BREAK = 1
+KIND_NAMES = ("focus", "break")
+
+class SessionRingBuffer:
+    """Fixed-size, array-backed ring buffer of (kind, app, start, end) session records.
+    - Columns live in preallocated typed arrays, apps are stored as small integer IDs
+    - Records not yet persisted are counted so they can be drained in batches
+    - When the buffer wraps before a flush, the oldest unflushed records are dropped and counted
+    """
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.kinds = array("b", [0]) * capacity
+        self.app_ids = array("i", [0]) * capacity
+        self.starts = array("d", [0.0]) * capacity
+        self.ends = array("d", [0.0]) * capacity
+        self.app_names = [""]
+        self.app_index = {"": 0}
+        self.lock = threading.Lock()
+        self.head = 0
+        self.count = 0
+        self.unflushed = 0
+        self.dropped = 0
+
+    def app_id(self, app: str):
+        app_id = self.app_index.get(app)
+        if app_id is None:
+            app_id = len(self.app_names)
+            self.app_names.append(app)
+            self.app_index[app] = app_id
+        return app_id
+
+    def append(self, kind: int, app: str, start: float, end: float):
+        with self.lock:
+            i = self.head
+            self.kinds[i] = kind
+            self.app_ids[i] = self.app_id(app)
+            self.starts[i] = start
+            self.ends[i] = end
+            self.head = (i + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+            if self.unflushed == self.capacity:
+                self.dropped += 1
+            else:
+                self.unflushed += 1
+
+    def _record(self, i):
+        return (KIND_NAMES[self.kinds[i]], self.app_names[self.app_ids[i]], self.starts[i], self.ends[i])
+
+    def records(self, last_n: int = None):
+        """Return buffered records oldest-first as (kind, app, start, end) tuples."""
+        with self.lock:
+            n = self.count if last_n is None else min(last_n, self.count)
+            first = (self.head - n) % self.capacity
+            return [self._record((first + k) % self.capacity) for k in range(n)]
+
+    def take_unflushed(self):
+        """Return records not yet persisted and mark them as flushed."""
+        with self.lock:
+            n = self.unflushed
+            first = (self.head - n) % self.capacity
+            pending = [self._record((first + k) % self.capacity) for k in range(n)]
+            self.unflushed = 0
+            return pending
+
+class SessionTracker:
+    """Turn per-tick activity observations into contiguous focus and break sessions.
+    A focus session is a contiguous active stretch in one app; a break is a contiguous
+    idle stretch. Closed sessions go into the ring buffer and are persisted in batches.
+    """
+    def __init__(self, capacity: int = 1024, batch_size: int = 32, flush_interval: float = 300):
+        self.buffer = SessionRingBuffer(capacity)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.last_flush = time.monotonic()
+        self.current = None
+
+    def observe(self, now: float, kind, app: str = "", started: float = None):
+        """Record the activity seen at `now` (epoch seconds); `kind` None means neither focus nor break."""
+        current = self.current
+        if current is not None and current[0] == kind and current[1] == app:
+            current[3] = now
+            return
+        start = now if started is None else started
+        if current is not None:
+            self.buffer.append(current[0], current[1], current[2], max(current[2], min(now, start)))
+        self.current = [kind, app, start, now] if kind is not None else None
+
+    def close(self, now: float = None):
+        """Close the running session (pause, day rollover, shutdown)."""
+        if self.current is not None:
+            kind, app, start, last = self.current
+            self.buffer.append(kind, app, start, max(start, now if now is not None else last))
+            self.current = None
+
+    def should_flush(self):
+        return (self.buffer.unflushed >= self.batch_size
+                or (self.buffer.unflushed and time.monotonic() - self.last_flush >= self.flush_interval))
+
+    def take_pending_rows(self):
+        """Drain unflushed records as DB rows (kind, app_name, start_time, end_time, date)."""
+        self.last_flush = time.monotonic()
+        if self.buffer.dropped:
+            logger.warning(f"Session buffer overflowed, {self.buffer.dropped} records dropped before flush.")
+            self.buffer.dropped = 0
+        return [
+            (kind, app, start, end, datetime.fromtimestamp(start).strftime("%Y-%m-%d"))
+            for kind, app, start, end in self.buffer.take_unflushed()
+        ]
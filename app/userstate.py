@@ -1,13 +1,106 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 from utilities import Utility
+from sampler import AdaptiveSampler
+from audio_probe import audio_provider
+from keyword_matcher import video_matcher
+from sessions import SessionTracker, FOCUS, BREAK
 from app_logger import logger
+from types import MappingProxyType
+from collections import deque
+from typing import NamedTuple
+from array import array
 import threading
+import time
+
+class AppUsageCounters:
+    """Per-app screen time keyed by interned app names mapped to small integer IDs.
+    Seconds live in a growable array('d'), so a tick adds to an existing slot instead of
+    rebuilding dict entries, and memory stays flat for the apps seen so far.
+    """
+    __slots__ = ("ids", "names", "seconds")
+
+    def __init__(self, initial=None):
+        self.ids = {}
+        self.names = []
+        self.seconds = array("d")
+        if initial:
+            self.update(initial)
+
+    def app_id(self, app: str):
+        app_id = self.ids.get(app)
+        if app_id is None:
+            app = sys.intern(app)
+            app_id = len(self.names)
+            self.ids[app] = app_id
+            self.names.append(app)
+            self.seconds.append(0.0)
+        return app_id
+
+    def add(self, app: str, seconds: float):
+        self.seconds[self.app_id(app)] += seconds
+
+    def get(self, app: str, default=0):
+        app_id = self.ids.get(app)
+        if app_id is None or not self.seconds[app_id]:
+            return default
+        return self.seconds[app_id]
+
+    def update(self, usage: dict):
+        """Overwrite counters from a {app: seconds} mapping (e.g. loaded from the DB)."""
+        for app, seconds in usage.items():
+            self.seconds[self.app_id(app)] = float(seconds)
+
+    def clear(self):
+        """Zero every counter but keep the interned IDs for reuse on the next day."""
+        for i in range(len(self.seconds)):
+            self.seconds[i] = 0.0
+
+    def items(self):
+        return [(name, secs) for name, secs in zip(self.names, self.seconds) if secs]
+
+    def copy(self):
+        """Return a plain {app: seconds} dict of the non-zero counters."""
+        return dict(self.items())
+
+    def __len__(self):
+        return sum(1 for secs in self.seconds if secs)
+
+    def __contains__(self, app):
+        return bool(self.get(app))
+
+class StateSnapshot(NamedTuple):
+    """Immutable view of the tracked state, published after every tracker update."""
+    seq: int
+    date: str
+    screen_time: float
+    total_break_duration: float
+    total_stretch_time: float
+    idle_time: float
+    active_window: str
+    is_active_audio: bool
+    is_paused: bool
+    on_break: bool
+    sample_interval: float
+    app_usage: MappingProxyType
 
 class UserActivityState:
-    """Mutable in-memory state for tracking user activity, app usage, and timers."""
+    """Mutable in-memory state for tracking user activity, app usage, and timers.
+    Only the tracker thread mutates the counters. Other threads read `snapshot`, which is
+    replaced by a single reference assignment after each update, and request changes
+    through `submit()`; queued changes are applied at the start of the next update.
+    """
+    __slots__ = (
+        "idle_time", "active_window", "screen_time", "break_start_time", "total_break_duration",
+        "total_stretch_time", "is_active_audio", "last_check", "last_date", "lock",
+        "screentime_per_app", "blocked_apps", "blocked_urls", "is_paused", "setting_name",
+        "pomodoro", "pomodoro_cycle", "break_setting_name", "break_threshold", "idle_threshold",
+        "reminder_threshold", "dont_notify_apps", "sessions", "sampler", "sample_interval",
+        "window_keys", "snapshot", "pending", "listeners",
+    )
+
     def __init__(self):
         self.idle_time = 0
         self.active_window = ""
@@ -16,10 +109,10 @@ class UserActivityState:
         self.total_break_duration = 0
         self.total_stretch_time = 0
         self.is_active_audio = False
-        self.last_check = datetime.now()
-        self.last_date = self.last_check.date()  
+        self.last_check = time.monotonic()
+        self.last_date = date.today()
         self.lock = threading.Lock()
-        self.screentime_per_app = {}
+        self.screentime_per_app = AppUsageCounters()
         self.blocked_apps = set()
         self.blocked_urls = set()
         self.is_paused = False
@@ -31,19 +124,79 @@ class UserActivityState:
         self.idle_threshold = 60
         self.reminder_threshold = 45 * 60  
         self.dont_notify_apps =  set()
+        self.sessions = SessionTracker()
+        self.sampler = AdaptiveSampler()
+        self.sample_interval = self.sampler.interval
+        self.window_keys = {}
+        self.pending = deque()
+        self.listeners = []
+        self.snapshot = None
+        self.publish()
+
+    def submit(self, change):
+        """Queue `change(state)` to be applied by the tracker on its next update."""
+        self.pending.append(change)
+
+    def notify_change(self):
+        """Tell listeners (the reminder scheduler) that pause, break or threshold state changed."""
+        for listener in self.listeners:
+            try:
+                listener()
+            except Exception:
+                logger.exception("State change listener failed:")
 
-    def update(self):
+    def publish(self):
+        """Swap in a fresh immutable snapshot of the current counters."""
+        previous = self.snapshot
+        self.snapshot = StateSnapshot(
+            seq=previous.seq + 1 if previous else 0,
+            date=self.last_date.isoformat(),
+            screen_time=self.screen_time,
+            total_break_duration=self.total_break_duration,
+            total_stretch_time=self.total_stretch_time,
+            idle_time=self.idle_time,
+            active_window=self.active_window,
+            is_active_audio=self.is_active_audio,
+            is_paused=self.is_paused,
+            on_break=self.break_start_time is not None,
+            sample_interval=self.sample_interval,
+            app_usage=MappingProxyType(self.screentime_per_app.copy()),
+        )
+
+    def update(self, elapsed: float = None, suspended: float = 0.0):
         """Update activity metrics based on idle time, active window, and audio status.
+        `elapsed` is the awake time since the last update and `suspended` the sleep/hibernate
+        time in between, both from the timer's monotonic clock (measured here if not given).
         Edge-case handling:
         - Respect pause: when paused, do not mutate timers or accumulate breaks
-        - Day rollover: reset counters safely
+        - Day rollover: reset counters safely; the wall clock is only used for day bucketing
         - Break timing: accumulate break duration incrementally while idle
-        - Clamp elapsed to sane bounds to avoid large jumps on clock changes
+        - Suspended time is credited as break, never as screen time
+        - Clamp elapsed to sane bounds to avoid large jumps after stalls
+        - Slow sampling while idle: when input resumes, only the last fast slice counts as active
         - Avoid counting unknown window names in per-app map
+        - System probes run before taking the lock; audio comes from the cached provider
         """
+        process_name = idle_time = audio = None
+        if not self.is_paused:
+            process_name = Utility.get_active_window_title()
+            idle_time = Utility.get_idle_time()
+            audio = audio_provider.get()
+
         with self.lock:
-            now = datetime.now()
-            today = now.date()
+            while self.pending:
+                try:
+                    self.pending.popleft()(self)
+                except Exception:
+                    logger.exception("Failed to apply queued state change:")
+
+            mono = time.monotonic()
+            if elapsed is None:
+                elapsed = mono - self.last_check
+            self.last_check = mono
+            now = time.time()
+            today = date.today()
+            changed = False
 
             if self.screen_time > 86400: 
                 logger.warning("Screen time exceeded 24 hours, resetting to zero.")
@@ -55,51 +208,96 @@ class UserActivityState:
             if today != self.last_date:
                 self.reset_daily_counters()
                 self.last_date = today
+                changed = True
                 logger.info("Day rollover detect and handled properly.")
 
-            if self.is_paused:
-                self.last_check = now
+            if self.is_paused or idle_time is None:
+                self.sessions.close(now)
+                self.sampler.reset()
+                self.sample_interval = self.sampler.interval
+                self.publish()
                 return
 
-            process_name = Utility.get_active_window_title()
-            window = os.path.splitext(process_name)[0].lower() if process_name else ""
-            audio = Utility.get_active_audio_status()
+            window = self.window_key(process_name)
 
-            elapsed = (now - self.last_check).total_seconds()
+            if suspended > 0:
+                logger.info(f"System was suspended for {suspended:.1f}s, crediting it as break time.")
+                self.credit_break(suspended)
+                self.sessions.observe(now - elapsed, BREAK, started=now - elapsed - suspended)
+                changed = True
 
+            max_elapsed = self.sample_interval + 3
             if elapsed < 0:
                 elapsed = 0
-            elif elapsed > 5:
-                logger.warning(f"Large elapsed time detected: {elapsed:.2f}s, clamping to 5s")
-                elapsed = 5
+            elif elapsed > max_elapsed:
+                logger.warning(f"Large elapsed time detected: {elapsed:.2f}s, clamping to {max_elapsed}s")
+                elapsed = max_elapsed
 
-            self.idle_time = Utility.get_idle_time()
+            self.idle_time = idle_time
             self.active_window = window
             self.is_active_audio = audio
 
-            audio_app = self.active_window.lower()
-            import keywords
-            is_video_playback = any(kw in audio_app for kw in keywords.video_keywords)
+            is_video_playback = video_matcher.matches(self.active_window)
 
             is_active_user = (self.idle_time < 60) or (is_video_playback and self.is_active_audio)
 
             if is_active_user:
                 if self.break_start_time is not None:
                     self.break_start_time = None
+                    changed = True
+                    active_slice = min(elapsed, self.sampler.fast_interval)
+                    self.total_break_duration += elapsed - active_slice
+                    elapsed = active_slice
                 self.screen_time += elapsed
                 self.total_stretch_time += elapsed
                 if window and window != "unknow":
-                    self.screentime_per_app[window] = self.screentime_per_app.get(window, 0) + elapsed
+                    self.screentime_per_app.add(window, elapsed)
+                self.sessions.observe(now, FOCUS, window)
             else:
                 if not is_video_playback and self.idle_time >= 60:
                     if self.break_start_time is None:
                         logger.debug(f"total screen time: {self.get_formatted_screen_time(self.screen_time)}")
                         logger.debug("user is idle — starting break timer")
                         self.break_start_time = now
+                        changed = True
                     else:
                         self.total_break_duration += elapsed
+                    self.sessions.observe(now, BREAK, started=now - self.idle_time)
+                else:
+                    self.sessions.observe(now, None)
+
+            self.sample_interval = self.sampler.observe(self.idle_time)
+            self.publish()
+
+        if changed:
+            self.notify_change()
+
+    def reset_stretch(self):
+        """Restart the continuous-activity stretch (after a reminder or in a don't-notify app)."""
+        self.total_stretch_time = 0
+
+    def credit_break(self, seconds):
+        """Add suspend time to today's break, capped to the day."""
+        max_break = max(0, 86400 - self.screen_time)
+        self.total_break_duration = min(self.total_break_duration + seconds, max_break)
+
+    def reset_today(self):
+        """Clear today's counters (reset button)."""
+        self.screen_time = 0
+        self.total_break_duration = 0
+        self.screentime_per_app.clear()
 
-        self.last_check = now
+    def window_key(self, process_name):
+        """Return the interned per-app key for a process name ('Code.exe' -> 'code')."""
+        if not process_name:
+            return ""
+        key = self.window_keys.get(process_name)
+        if key is None:
+            if len(self.window_keys) >= 512:
+                self.window_keys.clear()
+            key = sys.intern(os.path.splitext(process_name)[0].lower())
+            self.window_keys[process_name] = key
+        return key
 
     def reset_daily_counters(self):
         """Reset daily counters when a new day is detected."""
@@ -109,6 +307,7 @@ class UserActivityState:
         self.total_stretch_time = 0
         self.screentime_per_app.clear()
         self.break_start_time = None
+        self.sessions.close()
 
     def get_formatted_screen_time(self, arg):
         """Convert duration in seconds to HH:MM:SS string."""
@@ -121,3 +320,4 @@ class UserActivityState:
         self.screentime_per_app.update(app_usage)
         self.blocked_apps = blocked_apps
         self.blocked_urls =blocked_urls
+        self.publish()
@@ -1,5 +1,7 @@
-from datetime import datetime, timedelta
+from process_cache import ProcessNameCache
+from clock import TickClock
 from app_logger import logger
+from typing import NamedTuple
 import threading
 import time
 import json
@@ -20,14 +22,29 @@ with open(os.path.join(BASE_DIR,'config.json') , 'r' , encoding='utf-8') as f:
 APP_VERSION = config["app_version"]
 UPDATE_MANIFEST_URL = config["update_manifest_url"]
 
+"""Seconds between two blocker scan passes."""
+BLOCKER_SCAN_INTERVAL = config.get("blocker_scan_interval", 1)
+
 
 """ Global application shutdown event (used by timers/trackers)."""
 shutdown_event = threading.Event()
 
-"""Dedicated shutdown for app blocker threads only."""
-app_blocker_shutdown_event = threading.Event()
+"""Foreground PID -> process name cache (one dict lookup per probe while the app is unchanged)."""
+process_name_cache = ProcessNameCache()
+
+"""Seconds to wait for killed processes to exit before reporting them as failures."""
+KILL_WAIT_TIMEOUT = config.get("kill_wait_timeout", 3)
+
+class KillReport(NamedTuple):
+    """Outcome of a bulk kill: counts, the PIDs that survived or refused access, and total latency (s)."""
+    requested: int
+    killed: int
+    alive: list
+    denied: list
+    latency: float
 
-app_blocker_threads = []
+"""Timer name -> TickClock, for jitter/drift/suspend stats."""
+timer_clocks = {}
 
 class Utility:
     """Collection of system utilities for activity tracking and app/URL blocking."""
@@ -107,12 +124,10 @@ class Utility:
         """Return process name of the foreground window (lower-level via Win32)."""
         import win32process
         import win32gui
-        import psutil
         handle = win32gui.GetForegroundWindow()
         try:
             _,process_id = win32process.GetWindowThreadProcessId(handle)
-            process_obj = psutil.Process(pid=process_id)
-            return process_obj.name()
+            return process_name_cache.get_name(process_id)
         except Exception:
             return 'Unknow'
 
@@ -173,77 +188,86 @@ class Utility:
 
     @staticmethod
     def terminate_blocked_app(process_name, blocked_apps):
-        """Terminate a process by name if it is present in the blocked set."""
+        """Terminate every process with this name if it is blocked, in one bulk kill."""
         try:
             if process_name in blocked_apps:
                 import psutil
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if proc.info['name'] == process_name:
-                        proc.kill()
-                logger.info(f"Terminated blocked app {process_name}")
+                pids = [proc.pid for proc in psutil.process_iter(['name']) if proc.info['name'] == process_name]
+                report = Utility.kill_process_trees(pids)
+                logger.info(f"Terminated blocked app {process_name}: {report.killed} processes in {report.latency * 1000:.1f} ms")
         except Exception as e:
             logger.error(f"Failed to terminate blocked app {process_name}: {e}")
 
     @staticmethod
     def kill_process_tree(pid):
         """Kill a process and all of its child processes by PID."""
-        import psutil
-        try:
-            parent = psutil.Process(pid)
-            for child in parent.children(recursive=True):
-                try:
-                    child.kill()
-                except psutil.NoSuchProcess:
-                    pass
-            parent.kill()
-        except psutil.NoSuchProcess:
-            pass
-        except psutil.AccessDenied:
-            logger.debug(f"Access denied for PID {pid} - try running as admin.")
+        return Utility.kill_process_trees([pid])
 
     @staticmethod
-    def background_scanner(blocked_apps: set, scan_interval: int = 5):
-        """Scan processes periodically and kill those matching blocked apps (fast shutdown)."""
+    def kill_process_trees(pids, timeout: float = KILL_WAIT_TIMEOUT) -> KillReport:
+        """Kill several processes and their descendants in one batch.
+        - Each tree is resolved once; a child shared by two trees is only killed once
+        - Kill signals are sent back to back, then psutil.wait_procs waits for all of them together
+        - Processes still alive after `timeout`, or that refused access, are reported as failures
+        """
         import psutil
-        while not app_blocker_shutdown_event.is_set():
+        started = time.perf_counter()
+        procs = {}
+        denied = []
+        for pid in pids:
             try:
-                for proc in psutil.process_iter(['name', 'pid']):
-                    if app_blocker_shutdown_event.is_set():
-                        break
-                    try:
-                        proc_name = proc.info['name']
-                        if proc_name and proc_name.lower() in blocked_apps:
-                            logger.info(f"[SCAN] Blocking {proc_name} (PID: {proc.info['pid']})")
-                            Utility.kill_process_tree(proc.info['pid'])
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
-                
-                for _ in range(scan_interval):
-                    if app_blocker_shutdown_event.is_set():
-                        break
-                    time.sleep(5)
-            except Exception as e:
-                logger.error(f"[SCAN] Unexpected error: {e}", exc_info=True)
-                if app_blocker_shutdown_event.is_set():
-                    break
+                parent = psutil.Process(pid)
+                for child in parent.children(recursive=True):
+                    procs.setdefault(child.pid, child)
+                procs.setdefault(pid, parent)
+            except psutil.NoSuchProcess:
+                pass
+            except psutil.AccessDenied:
+                denied.append(pid)
+
+        signalled = []
+        for proc in procs.values():
+            try:
+                proc.kill()
+                signalled.append(proc)
+            except psutil.NoSuchProcess:
+                pass
+            except psutil.AccessDenied:
+                denied.append(proc.pid)
+
+        gone, alive = psutil.wait_procs(signalled, timeout=timeout) if signalled else ([], [])
+        report = KillReport(
+            requested=len(pids),
+            killed=len(gone),
+            alive=[proc.pid for proc in alive],
+            denied=denied,
+            latency=time.perf_counter() - started,
+        )
+        if denied:
+            logger.debug(f"Access denied for PIDs {denied} - try running as admin.")
+        if alive:
+            logger.warning(f"Processes still alive {timeout}s after kill: {report.alive}")
+        return report
 
     @staticmethod
-    def wmi_event_watcher(blocked_apps: set):
-        """Watch process creation events and terminate newly started blocked apps."""
+    def wmi_event_watcher(matcher, stop_event: threading.Event):
+        """Watch process creation events and terminate newly started blocked apps.
+        `matcher` is anything with `match(name, exe)`, normally the blocker service.
+        """
         import pythoncom
         import wmi
         pythoncom.CoInitialize()
         try:
-            while not app_blocker_shutdown_event.is_set():
+            while not stop_event.is_set():
                 try:
                     c = wmi.WMI()
                     watcher = c.Win32_Process.watch_for("creation")
 
-                    while not app_blocker_shutdown_event.is_set():
+                    while not stop_event.is_set():
                         try:
                             new_proc = watcher(timeout_ms=1000)
 
-                            if new_proc and new_proc.Name.lower() in blocked_apps:
+                            if new_proc and matcher.match(new_proc.Name, new_proc.ExecutablePath):
                                 logger.info(f"Blocking {new_proc.Name} (PID: {new_proc.ProcessId})")
                                 Utility.kill_process_tree(new_proc.ProcessId)
 
@@ -259,7 +283,7 @@ class Utility:
 
                 except Exception as e:
                     logger.error(f"[WMI] Connection failed: {e}")
-                    if app_blocker_shutdown_event.is_set():
+                    if stop_event.is_set():
                         break
                     time.sleep(5) 
 
@@ -267,39 +291,18 @@ class Utility:
             pythoncom.CoUninitialize()
 
     @staticmethod
-    def start_app_blocker(blocked_apps: set, scan_interval: int = 5 ):
-        """Start both background scanner and WMI watcher for the given blocked apps."""
-        global app_blocker_threads
-        if not blocked_apps:
-            return  
-        
-        app_blocker_shutdown_event.clear()
-        t1 = threading.Thread(target=Utility.background_scanner, args=(blocked_apps, scan_interval), daemon=True)
-        t2 = threading.Thread(target=Utility.wmi_event_watcher, args=(blocked_apps,), daemon=True)
-
-        t1.start()
-        t2.start()
-
-        app_blocker_threads = [t1 , t2]
-        logger.info(f"App blocker started for: {', '.join(blocked_apps)}")
+    def start_app_blocker(blocked_apps: set):
+        """Set the user's blocked apps on the blocker service and make sure it is running."""
+        from blocker import blocker_service
+        blocker_service.set_rules(blocked_apps)
+        if blocked_apps:
+            blocker_service.start()
 
     @staticmethod
     def stop_app_blocker():
-        """Stop app blocker threads and reset internal state safely."""
-        global app_blocker_threads
-        if not app_blocker_threads:
-            return
-
-        app_blocker_shutdown_event.set()
-
-        def join_threads():
-            for thread in app_blocker_threads:
-                if thread.is_alive():
-                    thread.join(timeout=5) 
-            logger.info("App blocker threads stopped.")
-
-        threading.Thread(target=join_threads, daemon=True).start()
-        app_blocker_threads = []
+        """Stop the blocker service pipeline."""
+        from blocker import blocker_service
+        blocker_service.stop()
     
     @staticmethod
     def block_url(HOST_PATH , website):
@@ -397,32 +400,51 @@ class Utility:
             return None
 
     @staticmethod
-    def run_precise_timer(interval: float, func: callable, *args, **kwargs):
-        """High-precision timer that passes detected sleep/idle gaps to the callback."""
-        next_time = time.time()
-        last_real_time = datetime.now() 
+    def run_precise_timer(interval: float, func: callable, *args, name: str = "timer", **kwargs):
+        """Monotonic fixed-rate timer; the callback gets a `tick` with awake/suspended time since the last run."""
+        clock = timer_clocks[name] = TickClock(name)
 
         while not shutdown_event.is_set():
             try:
-                now_real = datetime.now()
-                gap_seconds = (now_real - last_real_time).total_seconds()
-                last_real_time = now_real
+                tick = clock.tick(interval)
+                func(*args, tick=tick, **kwargs)
+                shutdown_event.wait(clock.schedule(interval))
 
-                func(*args, gap_seconds=gap_seconds, **kwargs)
+            except Exception as e:
+                logger.error(f"Precise timer crashed: {e}", exc_info=True)
+                if shutdown_event.is_set():
+                    return
+                time.sleep(1)
 
-                next_time += interval
-                sleep_time = next_time - time.time()
+    @staticmethod
+    def run_adaptive_timer(sampler, func: callable, *args, name: str = "adaptive", **kwargs):
+        """Monotonic timer whose interval follows the adaptive sampler.
+        While on a slow interval it only polls the cheap idle probe at the fast rate,
+        and runs the full tick early as soon as user input is detected.
+        """
+        clock = timer_clocks[name] = TickClock(name)
+
+        while not shutdown_event.is_set():
+            try:
+                tick = clock.tick(sampler.interval)
+                func(*args, tick=tick, **kwargs)
 
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                else:
-                    next_time = time.time()
+                clock.schedule(sampler.interval)
+                while not shutdown_event.is_set():
+                    sleep_time = clock.remaining()
+                    if sleep_time <= 0:
+                        break
+                    if shutdown_event.wait(min(sleep_time, sampler.fast_interval)):
+                        return
+                    if sampler.level > 0 and sampler.input_detected(Utility.get_idle_time()):
+                        clock.restart()
+                        break
 
             except Exception as e:
-                logger.error(f"Precise timer crashed: {e}", exc_info=True)
+                logger.error(f"Adaptive timer crashed: {e}", exc_info=True)
                 if shutdown_event.is_set():
                     return
-                time.sleep(1) 
+                time.sleep(1)
 
     @staticmethod
     def thread_monitor():